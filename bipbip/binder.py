@@ -1,12 +1,94 @@
 import json
 import os
+import concurrent.futures
 from typing import List, Optional, Tuple
 import random
 import string
+import warnings
 import encryption
-import base64
 
-class Binder(object):
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from pybase64 import b64decode, b64encode_as_string
+except ImportError:
+    from base64 import b64decode, b64encode
+
+    def b64encode_as_string(s: bytes) -> str:
+        return b64encode(s).decode('ascii')
+
+_CHARS = string.ascii_letters + string.digits
+
+class _Site(object):
+    """
+    _Site stores the website info of a website in memory.
+
+    The attributes are associated with the keys of the website info in the decrypted data :
+    name -> '__name__', encrypted -> '__encrypted__', data -> '__data__', types -> '__types__', blob -> '__blob__', lengths -> '__lengths__'.
+    The optional attributes are None if the key is not in the website info.
+    """
+    __slots__ = ('name', 'encrypted', 'data', 'types', 'blob', 'lengths')
+    _optional_keys = (('data', '__data__'), ('types', '__types__'), ('blob', '__blob__'), ('lengths', '__lengths__'))
+
+    def __init__(self, name: str, encrypted: bool = False, data: Optional[list] = None,
+                 types: Optional[List[str]] = None, blob: Optional[str] = None, lengths: Optional[List[int]] = None) -> None:
+        self.name = name
+        self.encrypted = encrypted
+        self.data = data
+        self.types = types
+        self.blob = blob
+        self.lengths = lengths
+
+    @classmethod
+    def from_dict(cls, website_info: dict) -> '_Site':
+        """
+        creates the site from the website info of the decrypted data.
+        """
+        return cls(website_info['__name__'], website_info['__encrypted__'], website_info.get('__data__'),
+                   website_info.get('__types__'), website_info.get('__blob__'), website_info.get('__lengths__'))
+
+    def to_dict(self) -> dict:
+        """
+        returns the website info of the site for the decrypted data.
+        """
+        website_info = {'__name__': self.name, '__encrypted__': self.encrypted}
+        for attribute, key in self._optional_keys:
+            value = getattr(self, attribute)
+            if value is not None:
+                website_info[key] = value
+        return website_info
+
+def _warn_code_lenght() -> None:
+    """
+    warns that code_lenght is a deprecated alias of code_length.
+    """
+    warnings.warn("code_lenght is deprecated, use code_length instead.", DeprecationWarning, stacklevel=3)
+
+class _BinderType(type):
+    """
+    _BinderType is the metaclass of Binder, it makes the deprecated code_lenght an alias of code_length on the class.
+    A code_lenght set in the body of a subclass is moved to code_length.
+    """
+    def __new__(mcs, name, bases, namespace):
+        if 'code_lenght' in namespace and not isinstance(namespace['code_lenght'], property):
+            _warn_code_lenght()
+            namespace['code_length'] = namespace.pop('code_lenght')
+        return super().__new__(mcs, name, bases, namespace)
+
+    @property
+    def code_lenght(cls) -> int:
+        _warn_code_lenght()
+        return cls.code_length
+
+    @code_lenght.setter
+    def code_lenght(cls, value: int) -> None:
+        _warn_code_lenght()
+        cls.code_length = value
+
+class Binder(object, metaclass=_BinderType):
     """
     binder is an object to save, read and interact with the users informations.
 
@@ -14,7 +96,7 @@ class Binder(object):
 
     userdict = json.load(data)
 
-    userdict = { website_code [str] : website_info [dict] }
+    userdict = { '__schema_version__' : schema_version [int], website_code [str] : website_info [dict] }
 
     website_info = { '__name__' : website_name [str] , '__data__' : website_data [list], '__encrypted__' : bool}
 
@@ -22,21 +104,58 @@ class Binder(object):
 
     website_datum = ( type [str] , datum = [str] )
 
+    For encrypted websites, the data are stored in a single encrypted blob and website_info becomes :
+
+    website_info = { '__name__' : website_name [str] , '__encrypted__' : True, '__types__' : types [list], '__blob__' : blob [str], '__lengths__' : lengths [list]}
+
+    types = [ type [str] ]
+
+    blob = base64 of the encrypted concatenation of the utf-8 encoded data.
+
+    lengths = [ length of the utf-8 encoded datum [int] ]
+
+    .. note::
+        Encrypted websites saved before the schema version 2 store each encrypted datum in '__data__'.
+        They are still readable and are converted to the blob layout the next time their data are set.
+        A userdict without '__schema_version__' is of schema version 1, it is set to 2 once a blob is stored.
+
+    .. note::
+        In memory, the website_info dicts are stored in the userdict as slotted site objects.
+        They are converted from and to dicts in load and dump.
+
     """
-    code_lenght = 10
-    private_website_code = []
+    code_length = 10
+    private_website_code = frozenset({'__schema_version__'})
     encryption_iterations = 100_000
+    schema_version = 2
+    thread_pool_threshold = 4
+
+    @property
+    def code_lenght(self) -> int:
+        """
+        deprecated alias of code_length.
+        """
+        _warn_code_lenght()
+        return self.code_length
+
+    @code_lenght.setter
+    def code_lenght(self, value: int) -> None:
+        _warn_code_lenght()
+        self.code_length = value
 
     def __init__(self) -> None:
         super().__init__()
-        self.userdict = {}
+        self.userdict = {'__schema_version__': self.schema_version}
+        self._codes_cache = None
 
     def load(self, data: bytearray) -> None:
         """
         loads the data from the decrypted data bytearray using json.loads to generate the userdict.
+        If orjson is installed, it is used instead of json to parse the bytearray directly.
 
         .. note::
             The data will be deleted from `data` in the method.
+            If an error is raised, the userdict is left unchanged.
 
         Parameters
         ----------
@@ -49,42 +168,66 @@ class Binder(object):
                 If the data is not bytearray.
             JSONDecodeError
                 If the data bytearray can't be read.
+            ValueError
+                If the schema version of the data is not supported.
+                If a website info of the data is not well structured.
         """
         if not isinstance(data, bytearray):
             raise TypeError("Parameter data is not bytearray.")
-        if len(data) == 0:
-            self.userdict = {}
+        if not data:
+            userdict = {'__schema_version__': self.schema_version}
+        elif orjson is not None:
+            userdict = orjson.loads(data)
         else :
-            self.userdict = json.loads(data.decode('utf-8'))
+            userdict = json.loads(data)
+        # Userdict saved before schema version 2 has no version : its encrypted website data are kept
+        # in the per-datum layout until they are set, as the user key is required to convert them.
+        if userdict.get('__schema_version__', 1) > self.schema_version:
+            raise ValueError("Parameter data has an unsupported schema version.")
+        # The sites are built in a new dict, the parsed dict is never left half converted.
+        sites = {}
+        for website_code, website_info in userdict.items():
+            if website_code in self.private_website_code:
+                sites[website_code] = website_info
+                continue
+            try:
+                sites[website_code] = _Site.from_dict(website_info)
+            except (KeyError, TypeError):
+                raise ValueError(f"Parameter data is not well structured for the website {website_code}.") from None
+        self.userdict = sites
+        self._codes_cache = None
     
     def dump(self) -> bytearray:
         """
         dumps the userdict into the decrypted data bytearray using json.dumps.
+        If orjson is installed, it is used instead of json to serialize the userdict directly into bytes.
 
         Returns
         -------
             data : bytearray
                 The decrypted data containing user informations.
         """
-        if len(self.userdict.keys()) == 0:
-            data = bytearray("".encode('utf-8'))
-        else :
-            data = bytearray(json.dumps(self.userdict).encode('utf-8'))
-        return data
+        # The sites are converted to dicts by the encoder default hook.
+        if orjson is not None:
+            return bytearray(orjson.dumps(self.userdict, default=_Site.to_dict))
+        return bytearray(json.dumps(self.userdict, default=_Site.to_dict, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
     
-    def listing_website_codes(self) -> List[str]:
+    def listing_website_codes(self) -> Tuple[str, ...]:
         """
-        returns the list containing the website codes.
+        returns the tuple containing the website codes.
+
+        .. note::
+            The tuple is cached until a website is added or removed.
 
         Returns
         -------
-            website_codes : List[str]
-                 The list containing the website codes.
+            website_codes : Tuple[str, ...]
+                 The tuple containing the website codes.
         """
-        website_codes = list(self.userdict.keys())
-        # Removing private code keys.
-        website_codes = [website_code for website_code in website_codes if website_code not in self.private_website_code]
-        return website_codes
+        if self._codes_cache is None:
+            # Removing private code keys.
+            self._codes_cache = tuple(website_code for website_code in self.userdict if website_code not in self.private_website_code)
+        return self._codes_cache
 
     def is_website_code(self, website_code: str) -> bool:
         """
@@ -107,7 +250,7 @@ class Binder(object):
         """
         if not isinstance(website_code, str):
             raise TypeError("Parameter website_code must be a string")
-        return website_code in self.listing_website_codes()
+        return website_code in self.userdict and website_code not in self.private_website_code
 
     def generate_website_code(self) -> str:
         """
@@ -118,13 +261,42 @@ class Binder(object):
             website_code : str
                 A new website code used instead.
         """
-        chars = string.ascii_letters + string.digits
-        website_code = ''.join(random.choice(chars) for _ in range(self.code_lenght))
-        website_codes = self.listing_website_codes()
-        while website_code in website_codes or website_code in self.private_website_code: 
-            website_code = ''.join(random.choice(chars) for _ in range(self.code_lenght))
+        code_length = self.code_length
+        userdict = self.userdict
+        private_website_code = self.private_website_code
+        website_code = ''.join(random.choices(_CHARS, k=code_length))
+        while website_code in userdict or website_code in private_website_code: 
+            website_code = ''.join(random.choices(_CHARS, k=code_length))
         return website_code
 
+    def _require_code(self, website_code: str) -> _Site:
+        """
+        returns the site of the given website code.
+
+        Parameters
+        ----------
+            website_code : str
+                 The code of a website.
+
+        Returns
+        -------
+            site : _Site
+                The site stored in the userdict.
+
+        Raises
+        ------
+            TypeError
+                If the website code is not a string.
+            ValueError
+                If the website code is not associated with an existing website.
+        """
+        if not isinstance(website_code, str):
+            raise TypeError("Parameter website_code must be a string")
+        site = self.userdict.get(website_code)
+        if site is None or website_code in self.private_website_code:
+            raise ValueError("Parameter website_code is not associated with an existing website.")
+        return site
+
     def get_website_name(self, website_code: str) -> str:
         """
         returns the name of the given website.
@@ -146,9 +318,7 @@ class Binder(object):
             ValueError
                 If the website code is not associated with an existing website.
         """
-        if not self.is_website_code(website_code):
-            raise ValueError("Parameter website_code is not associated with an existing website.")
-        return self.userdict[website_code]['__name__']
+        return self._require_code(website_code).name
     
     def set_website_name(self, website_code: str, website_name: str) -> None:
         """
@@ -168,11 +338,10 @@ class Binder(object):
             ValueError
                 If the website code is not associated with an existing website.
         """
-        if not self.is_website_code(website_code):
-            raise ValueError("Parameter website_code is not associated with an existing website.")
+        site = self._require_code(website_code)
         if not isinstance(website_name, str):
             raise TypeError("Parameter website_name is not a string.")
-        self.userdict[website_code]['__name__'] = website_name
+        site.name = website_name
 
     def get_website_data_number(self, website_code: str) -> int:
         """
@@ -195,9 +364,10 @@ class Binder(object):
             ValueError
                 If the website code is not associated with an existing website.
         """
-        if not self.is_website_code(website_code):
-            raise ValueError("Parameter website_code is not associated with an existing website.")
-        return len(self.userdict[website_code]['__data__'])
+        site = self._require_code(website_code)
+        if site.blob is not None:
+            return len(site.types)
+        return len(site.data)
 
     def is_encrypted_website_data(self, website_code: str) -> bool:
         """
@@ -220,16 +390,16 @@ class Binder(object):
             ValueError
                 If the website code is not associated with an existing website.
         """
-        if not self.is_website_code(website_code):
-            raise ValueError("Parameter website_code is not associated with an existing website.")
-        return self.userdict[website_code]['__encrypted__']
+        return self._require_code(website_code).encrypted
     
-    def set_website_data_encryption(website_code, set_encrypted: bool) -> None:
+    def set_website_data_encryption(self, website_code: str, set_encrypted: bool) -> None:
         """
         Activates or deactivates encryption of a website.
 
         .. warning::
             The data must be reset in the website to apply changes ! 
+            The encryption can be deactivated only once the encrypted data have been emptied,
+            otherwise the encrypted data would be returned as decrypted data.
         
         Parameters
         ----------
@@ -245,12 +415,17 @@ class Binder(object):
                 If the set_encrypted is not a booleen.
             ValueError
                 If the website code is not associated with an existing website.
+                If the encryption is deactivated while encrypted data are stored.
         """
-        if not self.is_website_code(website_code):
-            raise ValueError("Parameter website_code is not associated with an existing website.")
+        site = self._require_code(website_code)
         if not isinstance(set_encrypted, bool):
             raise TypeError("Parameter set_encrypted is not a boolen.")
-        self.userdict[website_code]['__encrypted__'] = set_encrypted
+        if site.encrypted and not set_encrypted:
+            if self.get_website_data_number(website_code) > 0:
+                raise ValueError("Website data are encrypted, they must be emptied before the encryption is deactivated.")
+            site.data = []
+            site.types = site.blob = site.lengths = None
+        site.encrypted = set_encrypted
 
     def get_website_data(self, website_code: str, *, user_key: Optional[bytearray] = None) -> List[Tuple[str, str]]:
         """
@@ -275,28 +450,55 @@ class Binder(object):
                 If the user_key is not un bytearray when the data are encrypted.
             ValueError
                 If the website code is not associated with an existing website.
+                If the encryption has been deactivated while the data are still stored in an encrypted blob.
             encryption.WrongKeyError
                 If the user_key is incorrect.
                 If the encryptedtext has been modified.
+            binascii.Error
+                If the stored encrypted data are not valid base64.
         """
-        if not self.is_encrypted_website_data(website_code):
-            return self.userdict[website_code]['__data__']
+        site = self._require_code(website_code)
+        if not site.encrypted:
+            if site.blob is not None:
+                raise ValueError("Website data are stored encrypted, they must be reset after the encryption is deactivated.")
+            return site.data
         # if encryption
         if user_key is None:
             raise TypeError("Parameter user_key is required for encrypted website data.")
         if not isinstance(user_key, bytearray): 
             raise TypeError("Parameter user_key is not bytearray.")
-        website_data = self.userdict[website_code]['__data__']
-        for index, datum in enumerate(website_data):
+        if site.blob is not None:
+            # The whole data are decrypted at once, then split with the lengths of each datum.
+            try:
+                decrypted_blob = encryption.encryptedtext_to_data(bytearray(b64decode(site.blob.encode('ascii'), validate=True)), user_key, iterations = self.encryption_iterations)
+            finally:
+                encryption.delete_bytearray(user_key)
+            website_data = []
+            start = 0
             try:
-                encrypted_datum = bytearray(base64.b64decode(datum[1]))
-                decrypted_datum = encryption.encryptedtext_to_data(encrypted_datum, user_key.copy(), iterations = self.encryption_iterations)
-                website_data[index] = (datum[0], decrypted_datum.decode('utf-8'))
-            except encryption.WrongKeyError:
-                encryption.delete_bytearray(user_key) # Securely delete user_key from memory if decryption fails
-                raise
-        encryption.delete_bytearray(user_key)
-        return website_data
+                with memoryview(decrypted_blob) as view:
+                    for datum_type, length in zip(site.types, site.lengths):
+                        website_data.append((datum_type, str(view[start:start + length], 'utf-8')))
+                        start += length
+            finally:
+                encryption.delete_bytearray(decrypted_blob)
+            return website_data
+        # Website data saved before the schema version 2 : each datum is encrypted with the user key.
+        def decrypt_datum(datum: str) -> str:
+            return encryption.encryptedtext_to_data(bytearray(b64decode(datum.encode('ascii'), validate=True)), user_key.copy(), iterations = self.encryption_iterations).decode('utf-8')
+
+        # The stored data stay encrypted, the decrypted data are built in a new list.
+        # The key is securely deleted from memory exactly once, even if decryption fails.
+        try:
+            if len(site.data) < self.thread_pool_threshold:
+                decrypted_data = [decrypt_datum(datum) for datum_type, datum in site.data]
+            else:
+                # The data are independent, their decryptions are dispatched in a thread pool (map preserves the order).
+                with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                    decrypted_data = list(executor.map(decrypt_datum, [datum for datum_type, datum in site.data]))
+        finally:
+            encryption.delete_bytearray(user_key)
+        return [(datum_type, decrypted_datum) for (datum_type, datum), decrypted_datum in zip(site.data, decrypted_data)]
 
     def set_website_data(self, website_code: str, website_data: List[Tuple[str, str]], *, user_key: Optional[bytearray] = None) -> None:
         """
@@ -321,25 +523,38 @@ class Binder(object):
                 If the website code is not associated with an existing website.
                 If the website data is not is not well structured.
         """
+        site = self._require_code(website_code)
         if not isinstance(website_data, list):
             raise TypeError("Parameter website_data is not list.")
-        if not all(isinstance(website_datum, tuple) and len(website_datum) == 2 and all(isinstance(datum,str) for datum in website_datum) for website_datum in website_data):
-            raise ValueError("Parameter website_data is not well structured.")
-        if not self.is_encrypted_website_data(website_code):
-            self.userdict[website_code]['__data__'] = website_data
+        for website_datum in website_data:
+            if not isinstance(website_datum, tuple) or len(website_datum) != 2 or not isinstance(website_datum[0], str) or not isinstance(website_datum[1], str):
+                raise ValueError("Parameter website_data is not well structured.")
+        if not site.encrypted:
+            site.data = website_data
+            site.types = site.blob = site.lengths = None
             return 
         # if encryption
         if user_key is None:
             raise TypeError("Parameter user_key is required for encrypted website data.")
         if not isinstance(user_key, bytearray): 
             raise TypeError("Parameter user_key is not bytearray.")
-        for index, datum in enumerate(website_data):
-            decrypted_datum = bytearray(datum[1].encode('utf-8'))
-            encrypted_datum = encryption.data_to_encryptedtext(decrypted_datum, user_key.copy(), iterations = self.encryption_iterations)
-            website_data[index] = (datum[0], base64.b64encode(encrypted_datum).decode('utf-8'))
-        self.userdict[website_code]['__data__'] = website_data
-        encryption.delete_bytearray(user_key)
-        return website_data
+        # The whole data are concatenated to be encrypted at once.
+        decrypted_blob = bytearray()
+        lengths = []
+        for datum_type, datum in website_data:
+            encoded_datum = datum.encode('utf-8')
+            lengths.append(len(encoded_datum))
+            decrypted_blob += encoded_datum
+        try:
+            encrypted_blob = encryption.data_to_encryptedtext(decrypted_blob, user_key, iterations = self.encryption_iterations)
+        finally:
+            encryption.delete_bytearray(user_key)
+            encryption.delete_bytearray(decrypted_blob)
+        site.data = None
+        site.types = [datum_type for datum_type, datum in website_data]
+        site.blob = b64encode_as_string(encrypted_blob)
+        site.lengths = lengths
+        self.userdict['__schema_version__'] = self.schema_version
 
     def remove_website(self, website_code: str) -> None:
         """
@@ -357,9 +572,9 @@ class Binder(object):
             ValueError
                 If the website code is not associated with an existing website.
         """
-        if not self.is_website_code(website_code):
-            raise ValueError("Parameter website_code is not associated with an existing website.")
+        self._require_code(website_code)
         del self.userdict[website_code]
+        self._codes_cache = None
 
     def add_website(self, website_code: str, website_name: str = "") -> None:
         """
@@ -378,11 +593,14 @@ class Binder(object):
                 If the website code or name is not a string.
             ValueError
                 If the website code is associated with an existing website.
+                If the website code is a private code of the userdict.
         """
         if self.is_website_code(website_code):
             raise ValueError("Parameter website_code is associated with an existing website.")
-        self.userdict[website_code] = {"__name__" : "",
-                                       "__encrypted__" : False,
-                                       "__data__" : []}
-        self.set_website_name(website_code, website_name)
+        if website_code in self.private_website_code:
+            raise ValueError("Parameter website_code is a private code of the userdict.")
+        if not isinstance(website_name, str):
+            raise TypeError("Parameter website_name is not a string.")
+        self.userdict[website_code] = _Site(website_name, encrypted = False, data = [])
+        self._codes_cache = None
         
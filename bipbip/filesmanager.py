@@ -1,14 +1,44 @@
 import os
 import shutil
-from typing import List
+import stat
+import tempfile
+import functools
+import time
+import concurrent.futures
+from typing import Iterator, List, Optional, Tuple
 import encryption
 import re
 
+_BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ACCOUNTS_DIR = os.path.join(_BASE, 'files', 'accounts')
+_ICONBANK_UI_DIR = os.path.join(_BASE, 'files', 'iconbank', 'iconui')
+_DEFAULT_PROFILE_ICON = os.path.join(_ICONBANK_UI_DIR, 'default_profile.png')
+_ACCOUNT_NAME_RE = re.compile(r'[A-Za-z0-9_\-]+\Z')
+_WIPE_CHUNK_SIZE = 65536
+_LANGUAGE_READ_SIZE = 64
+
+# Mode of the files created with open, used for the temporary files created by tempfile.mkstemp with the mode 0o600.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_DEFAULT_FILE_MODE = 0o666 & ~_UMASK
+
+# Expiry time of the website icons known to be missing, keyed by (account, website_code).
+_ICON_MISS = {}
+_MISS_TTL = 2.0
+_MISS_MAX_SIZE = 1024
+
+# Set the environment variable BIPBIP_PARALLEL_SCAN=1 to check the account entries in a thread pool
+# (useful when the 'accounts' directory is on a network file system).
+_PARALLEL_SCAN_THRESHOLD = 32
+_PARALLEL_SCAN_WORKERS = 16
 
 def dirname(path: str, deep: int = 1) -> str:
     """
     dirname apply os.path.dirname deep times on the given path.
 
+    .. note::
+        dirname is kept for compatibility, the module paths are computed once at import with os.path.dirname.
+
     Parameters
     ----------
         path : str
@@ -34,10 +64,130 @@ def dirname(path: str, deep: int = 1) -> str:
         raise TypeError("The deep must be an integer.")
     if deep <= 0:
         raise ValueError("The deep must be a positive integer")
-    for iteration in range(deep):
+    for _ in range(deep):
         path = os.path.dirname(path)
     return path
 
+def _copy_file(src: str, dst: str) -> None:
+    """
+    Copies the content of the file src into the file dst.
+    The copy is done by the kernel with os.sendfile when available, shutil.copyfile is used otherwise.
+    
+    Parameters
+    ----------
+        src : str
+            The path of the file to copy.
+        dst : str
+            The path of the copy.
+    """
+    if hasattr(os, "sendfile"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                size = os.fstat(fsrc.fileno()).st_size
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            return
+        except OSError:
+            pass # sendfile is not supported for these files.
+    shutil.copyfile(src, dst)
+
+def _write_file(path: str, data: bytes) -> None:
+    """
+    Writes the data into the file path, created if needed with user-only permissions.
+    The file is written with os.open and os.write, without the buffered file object.
+    
+    Parameters
+    ----------
+        path : str
+            The path of the file.
+        data : bytes
+            The data to write.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o600)
+    try:
+        with memoryview(data) as view:
+            written = 0
+            while written < len(view):
+                written += os.write(fd, view[written:])
+    finally:
+        os.close(fd)
+
+def _delete_bytearrays(*buffers: bytearray) -> None:
+    """
+    Securely deletes all the given bytearrays from memory with encryption.delete_bytearray.
+    
+    Parameters
+    ----------
+        *buffers : bytearray
+            The bytearrays to delete.
+    """
+    delete_bytearray = encryption.delete_bytearray
+    for buffer in buffers:
+        delete_bytearray(buffer)
+
+def _replace_file(src: str, dst: str) -> None:
+    """
+    Replaces atomically the file dst by a copy of the file src.
+    The copy is written into a unique temporary file next to dst, which is then renamed with os.replace.
+    The file keeps the mode of the replaced file, or gets the default mode of the files created with open.
+    
+    Parameters
+    ----------
+        src : str
+            The path of the file to copy.
+        dst : str
+            The path of the file to replace.
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(dst).st_mode)
+    except FileNotFoundError:
+        mode = _DEFAULT_FILE_MODE
+    fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(dst))
+    os.close(fd)
+    try:
+        _copy_file(src, tmp)
+        os.chmod(tmp, mode)
+        os.replace(tmp, dst)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+def _remember_icon_miss(key: Tuple[str, str], now: float) -> None:
+    """
+    Remembers that the website icon of the key is missing until _MISS_TTL seconds after now.
+    When the cache is full, the expired entries are pruned, and the whole cache is cleared if it is still full.
+    
+    Parameters
+    ----------
+        key : Tuple[str, str]
+            The account name and the website code.
+        now : float
+            The current time given by time.monotonic.
+    """
+    if len(_ICON_MISS) >= _MISS_MAX_SIZE:
+        for expired_key in [cached_key for cached_key, expiry in _ICON_MISS.items() if expiry <= now]:
+            del _ICON_MISS[expired_key]
+        if len(_ICON_MISS) >= _MISS_MAX_SIZE:
+            _ICON_MISS.clear()
+    _ICON_MISS[key] = now + _MISS_TTL
+
+def _forget_icon_misses(account: str) -> None:
+    """
+    Forgets the missing website icons of the account.
+    
+    Parameters
+    ----------
+        account : str
+            The account name.
+    """
+    for key in [key for key in _ICON_MISS if key[0] == account]:
+        del _ICON_MISS[key]
+
 def is_valid_account_name(account: str) -> bool:
     """
     Validates whether the account name is valid. A valid name contains alphanumeric characters,
@@ -65,8 +215,7 @@ def is_valid_account_name(account: str) -> bool:
     if len(account) == 0:
         raise ValueError("The account name cannot be empty.")
     
-    pattern = r'^[A-Za-z0-9_-]+$'
-    return bool(re.match(pattern, account))
+    return _ACCOUNT_NAME_RE.match(account) is not None
 
 def exist_account(account: str) -> bool:
     """
@@ -92,9 +241,70 @@ def exist_account(account: str) -> bool:
     if not is_valid_account_name(account):
         raise ValueError("The account name is invalid.")
     
-    accountpath = os.path.join(dirname(__file__,2), 'files', 'accounts', account)
+    accountpath = os.path.join(_ACCOUNTS_DIR, account)
     return os.path.isdir(accountpath)
 
+@functools.lru_cache(maxsize=256)
+def _account_path(account: str) -> str:
+    """
+    Validates the account name and returns the path of the account's folder (the folder may not exist).
+
+    .. note::
+        The path of each validated account name is cached.
+    
+    Parameters
+    ----------
+        account : str
+            The account name.
+    
+    Returns
+    -------
+        str
+            The full path of the account's folder.
+    
+    Raises
+    ------
+        TypeError
+            If the account parameter is not a string.
+        ValueError
+            If the account name is invalid.
+    """
+    if not is_valid_account_name(account):
+        raise ValueError("The account name is invalid.")
+    
+    return os.path.join(_ACCOUNTS_DIR, account)
+
+def _resolve_account(account: str) -> str:
+    """
+    Validates the account name and returns the path of the account's folder.
+    The existence of the folder is checked on each call.
+    
+    Parameters
+    ----------
+        account : str
+            The account name.
+    
+    Returns
+    -------
+        str
+            The full path of the account's folder.
+    
+    Raises
+    ------
+        TypeError
+            If the account parameter is not a string.
+        ValueError
+            If the account name is invalid or if the account does not exist.
+    """
+    accountpath = _account_path(account)
+    try:
+        accountstat = os.stat(accountpath)
+    except FileNotFoundError:
+        accountstat = None
+    if accountstat is None or not stat.S_ISDIR(accountstat.st_mode):
+        raise ValueError(f"The account '{account}' does not exist.")
+    return accountpath
+
 def get_account_path(account: str) -> str:
     """
     Returns the full path of the account's folder.
@@ -116,34 +326,85 @@ def get_account_path(account: str) -> str:
         ValueError
             If the account does not exist.
     """
-    if not exist_account(account):
-        raise ValueError(f"The account '{account}' does not exist.")
-    
-    return os.path.join(dirname(__file__,2), 'files', 'accounts', account)
+    return _resolve_account(account)
 
-def get_existing_accounts() -> List[str]:
+def _maybe_parallel_is_dir(entries: List[os.DirEntry]) -> List[bool]:
     """
-    Returns a list of all existing accounts.
+    Returns for each directory entry if it is a directory.
+    If there are many entries, the checks are dispatched in a thread pool to overlap the stat latencies.
+    
+    Parameters
+    ----------
+        entries : List[os.DirEntry]
+            The directory entries.
     
     Returns
     -------
-        List[str]
-            A list of account names.
+        List[bool]
+            True for each entry which is a directory.
+    """
+    if len(entries) <= _PARALLEL_SCAN_THRESHOLD:
+        return [entry.is_dir() for entry in entries]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=_PARALLEL_SCAN_WORKERS) as executor:
+        return list(executor.map(os.DirEntry.is_dir, entries))
+
+def iter_existing_accounts(prefix: Optional[str] = None) -> Iterator[str]:
+    """
+    Yields the existing accounts, optionally only those starting with the given prefix.
+    
+    Parameters
+    ----------
+        prefix : Optional[str]
+            The prefix of the account names to yield. The default is None (all accounts).
+    
+    Yields
+    ------
+        str
+            An account name.
     
     Raises
     ------
         FileNotFoundError
             If the 'accounts' directory is not found.
     """
-    accounts_dir = os.path.join(dirname(__file__,2), 'files', 'accounts')
-    if not os.path.isdir(accounts_dir):
-        raise FileNotFoundError("The 'accounts' directory is not found.")
+    try:
+        with os.scandir(_ACCOUNTS_DIR) as iterator:
+            entries = (entry for entry in iterator if not prefix or entry.name.startswith(prefix))
+            if os.environ.get("BIPBIP_PARALLEL_SCAN") == "1":
+                entries = list(entries)
+                for entry, is_dir in zip(entries, _maybe_parallel_is_dir(entries)):
+                    if is_dir:
+                        yield entry.name
+            else:
+                for entry in entries:
+                    if entry.is_dir():
+                        yield entry.name
+    except (FileNotFoundError, NotADirectoryError):
+        raise FileNotFoundError("The 'accounts' directory is not found.") from None
+
+def get_existing_accounts() -> Tuple[str, ...]:
+    """
+    Returns a tuple of all existing accounts.
     
-    return [d for d in os.listdir(accounts_dir) if os.path.isdir(os.path.join(accounts_dir, d))]
+    Returns
+    -------
+        Tuple[str, ...]
+            A tuple of account names.
+    
+    Raises
+    ------
+        FileNotFoundError
+            If the 'accounts' directory is not found.
+    """
+    return tuple(iter_existing_accounts())
 
+@functools.lru_cache(maxsize=64)
 def get_UI_icon(icon_name: str) -> str:
     """
     Returns the ui icon associated with the given icon name. 
+
+    .. note::
+        The ui icons are shipped with the package, the path of each found icon is cached.
     
     Parameters
     ----------
@@ -167,13 +428,43 @@ def get_UI_icon(icon_name: str) -> str:
     if not isinstance(icon_name, str):
         raise TypeError("The 'icon_name' parameter must be a string.")
 
-    icon_path = os.path.join(dirname(__file__,2), "files", "iconbank", "iconui", icon_name + ".png")
+    icon_path = f"{_ICONBANK_UI_DIR}{os.sep}{icon_name}.png"
     
     if not os.path.isfile(icon_path):
         raise FileNotFoundError(f"UI icon {icon_path} not found.")
     
     return icon_path
 
+def _website_icon_path(account: str, website_code: str) -> str:
+    """
+    Validates the website code and returns the path of the icon for a website associated with a given account.
+    
+    Parameters
+    ----------
+        account : str
+            The account name.
+        website_code : str
+            The website code (site identifier).
+    
+    Returns
+    -------
+        str
+            The path of the website icon (the file may not exist).
+    
+    Raises
+    ------
+        TypeError
+            If the website_code parameter is not a string.
+        ValueError
+            If the account is invalid or does not exist.
+    """
+    if not isinstance(website_code, str):
+        raise TypeError("The 'website_code' parameter must be a string.")
+
+    accountpath = _resolve_account(account)
+    icons_dir = os.path.join(accountpath, "icons")
+    return f"{icons_dir}{os.sep}{website_code}.png"
+
 def get_website_icon(account: str, website_code: str) -> str:
     """
     Returns the icon for a website associated with a given account. If the icon does not exist, 
@@ -200,13 +491,22 @@ def get_website_icon(account: str, website_code: str) -> str:
         FileNotFoundError
             If the default icon is not found.
     """
-    if not isinstance(website_code, str):
-        raise TypeError("The 'website_code' parameter must be a string.")
-
-    accountpath = get_account_path(account)
-    icon_path = os.path.join(accountpath, "icons", website_code + ".png")
+    icon_path = _website_icon_path(account, website_code)
     
-    if not os.path.isfile(icon_path):
+    key = (account, website_code)
+    now = time.monotonic()
+    expiry = _ICON_MISS.get(key)
+    if expiry is not None:
+        if now < expiry:
+            return get_UI_icon("default_website")
+        del _ICON_MISS[key]
+    
+    try:
+        icon_stat = os.stat(icon_path)
+    except (OSError, ValueError):
+        icon_stat = None
+    if icon_stat is None or not stat.S_ISREG(icon_stat.st_mode):
+        _remember_icon_miss(key, now)
         return get_UI_icon("default_website")
     
     return icon_path
@@ -231,14 +531,11 @@ def remove_website_icon(account: str, website_code: str) -> None:
         FileNotFoundError
             If the icon file for the website is not found.
     """
-    if not isinstance(website_code, str):
-        raise TypeError("The 'website_code' parameter must be a string.")
-
-    accountpath = get_account_path(account)
-    icon_path = os.path.join(accountpath, "icons", website_code + ".png")
+    icon_path = _website_icon_path(account, website_code)
     
     if os.path.isfile(icon_path):
         os.remove(icon_path)
+    _ICON_MISS.pop((account, website_code), None)
 
 def set_website_icon(account: str, website_code: str, iconpath: str) -> None:
     """
@@ -262,18 +559,15 @@ def set_website_icon(account: str, website_code: str, iconpath: str) -> None:
         FileNotFoundError
             If the provided icon file is not found.
     """
-    if not isinstance(website_code, str):
-        raise TypeError("The 'website_code' parameter must be a string.")
     if not isinstance(iconpath, str):
         raise TypeError("The 'iconpath' parameter must be a string.")
     if not os.path.isfile(iconpath):
         raise FileNotFoundError(f"The icon file '{iconpath}' is not found.")
 
-    accountpath = get_account_path(account)
-    icon_path = os.path.join(accountpath, "icons", website_code + ".png")
+    icon_path = _website_icon_path(account, website_code)
     
-    remove_website_icon(account, website_code)
-    shutil.copyfile(iconpath, icon_path)
+    _replace_file(iconpath, icon_path)
+    _ICON_MISS.pop((account, website_code), None)
 
 def get_profile_icon(account: str) -> str:
     """
@@ -299,10 +593,14 @@ def get_profile_icon(account: str) -> str:
         FileNotFoundError
             If the default icon is not found.
     """
-    accountpath = get_account_path(account)
+    accountpath = _resolve_account(account)
     profile_icon_path = os.path.join(accountpath, "profile.png")
     
-    if not os.path.isfile(profile_icon_path):
+    try:
+        icon_stat = os.stat(profile_icon_path)
+    except (OSError, ValueError):
+        return get_UI_icon("default_profile")
+    if not stat.S_ISREG(icon_stat.st_mode):
         return get_UI_icon("default_profile")
     
     return profile_icon_path
@@ -332,10 +630,10 @@ def set_profile_icon(account: str, iconpath: str) -> None:
     if not os.path.isfile(iconpath):
         raise FileNotFoundError(f"The icon file '{iconpath}' is not found.")
     
-    accountpath = get_account_path(account)
+    accountpath = _resolve_account(account)
     profile_icon_path = os.path.join(accountpath, "profile.png")
     
-    shutil.copyfile(iconpath, profile_icon_path)
+    _replace_file(iconpath, profile_icon_path)
 
 def get_encryptedtext_filepath(account: str) -> str:
     """
@@ -361,7 +659,7 @@ def get_encryptedtext_filepath(account: str) -> str:
     if not isinstance(account, str):
         raise TypeError("The 'account' parameter must be a string.")
     
-    accountpath = get_account_path(account)
+    accountpath = _resolve_account(account)
     return os.path.join(accountpath, "encryptedtext.bin")
 
 def get_account_language(account: str) -> str:
@@ -385,14 +683,23 @@ def get_account_language(account: str) -> str:
         ValueError
             If the 'language.txt' file is not found.
     """
-    accountpath = get_account_path(account)
+    accountpath = _resolve_account(account)
     language_file = os.path.join(accountpath, "language.txt")
     
-    if not os.path.isfile(language_file):
-        raise ValueError(f"The language file for account '{account}' was not found.")
-    
-    with open(language_file, 'r') as f:
-        return f.read().strip()
+    try:
+        fd = os.open(language_file, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    except FileNotFoundError:
+        raise ValueError(f"The language file for account '{account}' was not found.") from None
+    # The whole file is read, os.read may return less than the requested size.
+    chunks = []
+    try:
+        chunk = os.read(fd, _LANGUAGE_READ_SIZE)
+        while chunk:
+            chunks.append(chunk)
+            chunk = os.read(fd, _LANGUAGE_READ_SIZE)
+    finally:
+        os.close(fd)
+    return b"".join(chunks).strip().decode('utf-8')
 
 def set_account_language(account: str, language: str) -> None:
     """
@@ -415,11 +722,10 @@ def set_account_language(account: str, language: str) -> None:
     if not isinstance(language, str):
         raise TypeError("The 'language' parameter must be a string.")
     
-    accountpath = get_account_path(account)
+    accountpath = _resolve_account(account)
     language_file = os.path.join(accountpath, "language.txt")
     
-    with open(language_file, 'w') as f:
-        f.write(language)
+    _write_file(language_file, language.encode('utf-8'))
 
 def create_account(account: str, password: bytearray, pin: bytearray, language: str = "en") -> None:
     """
@@ -465,21 +771,18 @@ def create_account(account: str, password: bytearray, pin: bytearray, language:
         raise ValueError(f"{account=} already created.")
 
     # Creating directory tree for the account
-    accountpath = os.path.join(dirname(__file__,2), "files", "accounts", account)
-    os.mkdir(accountpath)
-    os.mkdir(os.path.join(accountpath, "icons"))
+    accountpath = os.path.join(_ACCOUNTS_DIR, account)
+    os.makedirs(os.path.join(accountpath, "icons"))
     
     # Creating empty encryptedtext
-    data = bytearray("".encode('utf-8'))
+    data = bytearray()
     encryptedtext = encryption.data_to_encryptedtext(data, password, pin=pin)
     
-    with open(os.path.join(accountpath, "encryptedtext.bin"), "wb") as file:
-        file.write(encryptedtext)
-    
-    with open(os.path.join(accountpath, "language.txt"), "w") as file:
-        file.write(language)
+    _write_file(os.path.join(accountpath, "encryptedtext.bin"), encryptedtext)
+    _write_file(os.path.join(accountpath, "language.txt"), language.encode('utf-8'))
     
-    shutil.copyfile(get_UI_icon("default_profile"), os.path.join(accountpath, "profile.png"))
+    _copy_file(_DEFAULT_PROFILE_ICON, os.path.join(accountpath, "profile.png"))
+    _forget_icon_misses(account)
 
 def delete_account(account: str) -> None:
     """
@@ -500,20 +803,22 @@ def delete_account(account: str) -> None:
         FileNotFoundError
             If the account's directory is not found.
     """
-    accountpath = get_account_path(account)
-    encryptedtextfilepath = get_encryptedtext_filepath(account)
-    
-    # Erasing all information
-    with open(encryptedtextfilepath, "rb") as file:
-        encryptedtext = bytearray(file.read())
-    
-    with open(encryptedtextfilepath, "wb") as file:
-        file.write(encryption.random_bytearray(len(encryptedtext)))
+    accountpath = _resolve_account(account)
+    encryptedtextfilepath = os.path.join(accountpath, "encryptedtext.bin")
     
-    encryption.delete_bytearray(encryptedtext)
+    # Erasing all information by overwriting the encryptedtext in place with random chunks
+    remaining = os.path.getsize(encryptedtextfilepath)
+    with open(encryptedtextfilepath, "r+b") as file:
+        while remaining > 0:
+            chunk_size = min(_WIPE_CHUNK_SIZE, remaining)
+            file.write(encryption.random_bytearray(chunk_size))
+            remaining -= chunk_size
+        file.flush()
+        os.fsync(file.fileno())
     
     # Deleting the account subdirectory
     shutil.rmtree(accountpath)
+    _forget_icon_misses(account)
 
 def load_encryptedtext(account: str, password: bytearray, pin: bytearray) -> bytearray:
     """
@@ -543,8 +848,6 @@ def load_encryptedtext(account: str, password: bytearray, pin: bytearray) -> byt
             If the password or the pin is incorrect.
             If the encryptedtext has been modified.
     """
-    encryptedtextfilepath = get_encryptedtext_filepath(account)
-    
     if not isinstance(password, bytearray):
         raise TypeError("Parameter password is not bytearray")
     if not isinstance(pin, bytearray):
@@ -554,14 +857,16 @@ def load_encryptedtext(account: str, password: bytearray, pin: bytearray) -> byt
     if len(pin) == 0:
         raise ValueError("Parameter pin is empty")
     
+    accountpath = _resolve_account(account)
+    encryptedtextfilepath = os.path.join(accountpath, "encryptedtext.bin")
+    
     with open(encryptedtextfilepath, "rb") as file:
         encryptedtext = file.read()
 
     try:
         data = encryption.encryptedtext_to_data(encryptedtext, password, pin=pin)
     except encryption.WrongKeyError:
-        encryption.delete_bytearray(password)
-        encryption.delete_bytearray(pin)
+        _delete_bytearrays(password, pin)
         raise 
     
     return data
@@ -588,8 +893,6 @@ def dumps_encryptedtext(account: str, password: bytearray, pin: bytearray, data:
         ValueError
             If the account does not exist or is invalid, or if password and pin are empty.
     """
-    encryptedtextfilepath = get_encryptedtext_filepath(account)
-    
     if not isinstance(password, bytearray):
         raise TypeError("Parameter password is not bytearray")
     if not isinstance(pin, bytearray):
@@ -599,11 +902,12 @@ def dumps_encryptedtext(account: str, password: bytearray, pin: bytearray, data:
     if len(pin) == 0:
         raise ValueError("Parameter pin is empty")
     
+    accountpath = _resolve_account(account)
+    encryptedtextfilepath = os.path.join(accountpath, "encryptedtext.bin")
+    
     encryptedtext = encryption.data_to_encryptedtext(data, password, pin=pin)
     
-    encryption.delete_bytearray(password)
-    encryption.delete_bytearray(pin)
-    encryption.delete_bytearray(data)
+    _delete_bytearrays(password, pin, data)
     
     with open(encryptedtextfilepath, "wb") as file:
         file.write(encryptedtext)
@@ -1,6 +1,11 @@
 import os
 from setuptools import setup, find_packages
 
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    cythonize = None
+
 # Read the contents of your README file to use as the long description
 with open("README.md", "r") as fh:
     long_description = fh.read()
@@ -18,6 +23,18 @@ def read_version():
         exec(f.read()) 
     return locals()['__version__']
 
+# Compile the binder module with Cython only when BIPBIP_CYTHONIZE=1 is set, otherwise the pure python module is used.
+# Once requested, a missing Cython or a failing compilation stops the installation.
+def read_ext_modules():
+    if os.environ.get('BIPBIP_CYTHONIZE') != '1':
+        return []
+    if cythonize is None:
+        raise RuntimeError("BIPBIP_CYTHONIZE=1 is set but Cython is not installed.")
+    return cythonize(
+        [os.path.join('bipbip', 'binder.py')],
+        compiler_directives={'language_level': 3},
+    )
+
 setup(
     name="bipbip",  # Replace with your package name
     version=read_version(),  # Update the version as necessary
@@ -35,4 +52,5 @@ setup(
     ],
     python_requires='>=3.6',  # Minimum Python version required
     install_requires=read_requirements(),
+    ext_modules=read_ext_modules(),
 )
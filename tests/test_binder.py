@@ -0,0 +1,125 @@
+import unittest
+import json
+from base64 import b64encode
+
+import encryption
+
+# Import the Binder class from the binder.py module
+from bipbip.binder import Binder
+
+class TestBinder(unittest.TestCase):
+
+    def setUp(self):
+        """ Prepare the binder and the user key. """
+        self.binder = Binder()
+        self.user_key = bytearray("userkey123".encode('utf-8'))
+        self.website_data = [("login", "user"), ("password", "pässwörd")]
+
+    def test_01_blob_round_trip(self):
+        """ Test encrypted website data through dump and load. """
+        self.binder.add_website("abc", "website")
+        self.binder.set_website_data_encryption("abc", True)
+        self.binder.set_website_data("abc", self.website_data, user_key=self.user_key.copy())
+        binder = Binder()
+        binder.load(self.binder.dump())
+        self.assertEqual(binder.userdict['__schema_version__'], Binder.schema_version)
+        self.assertEqual(binder.get_website_data_number("abc"), 2)
+        self.assertEqual(binder.get_website_data("abc", user_key=self.user_key.copy()), self.website_data)
+
+    def test_02_load_legacy_encrypted_data(self):
+        """ Test reading encrypted website data saved datum by datum. """
+        data = []
+        for datum_type, datum in self.website_data:
+            encryptedtext = encryption.data_to_encryptedtext(bytearray(datum.encode('utf-8')), self.user_key.copy(), iterations=Binder.encryption_iterations)
+            data.append([datum_type, b64encode(encryptedtext).decode('ascii')])
+        userdict = {"abc": {"__name__": "website", "__data__": data, "__encrypted__": True}}
+        self.binder.load(bytearray(json.dumps(userdict).encode('utf-8')))
+        self.assertNotIn('__schema_version__', self.binder.userdict)
+        self.assertEqual(self.binder.get_website_data("abc", user_key=self.user_key.copy()), self.website_data)
+
+    def test_03_listing_website_codes(self):
+        """ Test the website codes after adding and removing websites. """
+        self.assertEqual(list(self.binder.listing_website_codes()), [])
+        self.binder.add_website("abc", "website")
+        self.assertEqual(list(self.binder.listing_website_codes()), ["abc"])
+        self.binder.remove_website("abc")
+        self.assertEqual(list(self.binder.listing_website_codes()), [])
+
+    def test_04_set_website_data_encryption(self):
+        """ Test activating and deactivating the encryption of a website. """
+        self.binder.add_website("abc", "website")
+        self.binder.set_website_data_encryption("abc", True)
+        self.assertTrue(self.binder.is_encrypted_website_data("abc"))
+        self.binder.set_website_data_encryption("abc", False)
+        self.assertFalse(self.binder.is_encrypted_website_data("abc"))
+
+    def test_05_add_private_website_code(self):
+        """ Test adding a website with a private code. """
+        with self.assertRaises(ValueError):
+            self.binder.add_website('__schema_version__', "website")
+
+    def test_06_code_lenght_alias(self):
+        """ Test the deprecated code_lenght alias of code_length. """
+        with self.assertWarns(DeprecationWarning):
+            self.binder.code_lenght = 12
+        self.assertEqual(self.binder.code_length, 12)
+        self.assertEqual(len(self.binder.generate_website_code()), 12)
+        with self.assertWarns(DeprecationWarning):
+            self.assertEqual(Binder.code_lenght, Binder.code_length)
+
+    def test_07_load_unsupported_schema_version(self):
+        """ Test that a rejected load leaves the binder unchanged. """
+        self.binder.add_website("abc", "website")
+        self.assertEqual(list(self.binder.listing_website_codes()), ["abc"])
+        userdict = {"__schema_version__": Binder.schema_version + 1, "x": {"__name__": "other", "__data__": [], "__encrypted__": False}}
+        with self.assertRaises(ValueError):
+            self.binder.load(bytearray(json.dumps(userdict).encode('utf-8')))
+        self.assertEqual(list(self.binder.listing_website_codes()), ["abc"])
+        self.assertEqual(self.binder.get_website_name("abc"), "website")
+        self.assertFalse(self.binder.is_website_code("x"))
+
+    def test_08_deactivate_encryption_with_encrypted_data(self):
+        """ Test deactivating the encryption while encrypted data are stored. """
+        encryptedtext = encryption.data_to_encryptedtext(bytearray("user".encode('utf-8')), self.user_key.copy(), iterations=Binder.encryption_iterations)
+        userdict = {"old": {"__name__": "website", "__data__": [["login", b64encode(encryptedtext).decode('ascii')]], "__encrypted__": True}}
+        self.binder.load(bytearray(json.dumps(userdict).encode('utf-8')))
+        self.binder.add_website("abc", "website")
+        self.binder.set_website_data_encryption("abc", True)
+        self.binder.set_website_data("abc", self.website_data, user_key=self.user_key.copy())
+        for website_code in ("old", "abc"):
+            with self.assertRaises(ValueError):
+                self.binder.set_website_data_encryption(website_code, False)
+            self.assertTrue(self.binder.is_encrypted_website_data(website_code))
+            self.binder.set_website_data(website_code, [], user_key=self.user_key.copy())
+            self.binder.set_website_data_encryption(website_code, False)
+            self.assertEqual(self.binder.get_website_data(website_code), [])
+
+    def test_09_load_not_well_structured(self):
+        """ Test that loading a website info without '__encrypted__' leaves the binder unchanged. """
+        self.binder.add_website("abc", "website")
+        userdict = {"a": {"__name__": "first", "__data__": [], "__encrypted__": False}, "b": {"__name__": "second", "__data__": []}}
+        with self.assertRaises(ValueError):
+            self.binder.load(bytearray(json.dumps(userdict).encode('utf-8')))
+        self.assertEqual(list(self.binder.listing_website_codes()), ["abc"])
+        self.assertEqual(self.binder.get_website_name("abc"), "website")
+
+    def test_10_load_legacy_encrypted_data_thread_pool(self):
+        """ Test reading many encrypted website data saved datum by datum in a thread pool. """
+        website_data = [("type{}".format(index), "datum{}".format(index)) for index in range(Binder.thread_pool_threshold + 2)]
+        data = []
+        for datum_type, datum in website_data:
+            encryptedtext = encryption.data_to_encryptedtext(bytearray(datum.encode('utf-8')), self.user_key.copy(), iterations=Binder.encryption_iterations)
+            data.append([datum_type, b64encode(encryptedtext).decode('ascii')])
+        userdict = {"abc": {"__name__": "website", "__data__": data, "__encrypted__": True}}
+        self.binder.load(bytearray(json.dumps(userdict).encode('utf-8')))
+        user_key = self.user_key.copy()
+        self.assertEqual(self.binder.get_website_data("abc", user_key=user_key), website_data)
+        self.assertFalse(any(user_key))  # Ensure the user key was deleted
+        wrong_key = bytearray("wrongkey".encode('utf-8'))
+        with self.assertRaises(encryption.WrongKeyError):
+            self.binder.get_website_data("abc", user_key=wrong_key)
+        self.assertFalse(any(wrong_key))  # Ensure the user key was deleted
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -53,6 +53,39 @@ class TestAccountManagement(unittest.TestCase):
         fm.delete_account(self.account_name)
         self.assertFalse(os.path.isdir(account_path))  # Ensure the account was deleted
 
+    def test_08_iter_existing_accounts_prefix(self):
+        """ Test fetching existing accounts with a prefix. """
+        fm.create_account(self.account_name, self.password, self.pin)
+        self.assertIn(self.account_name, list(fm.iter_existing_accounts(prefix="----test")))
+        self.assertNotIn(self.account_name, list(fm.iter_existing_accounts(prefix="other")))
+        fm.delete_account(self.account_name)
+
+    def test_09_get_account_path_removed_account(self):
+        """ Test the account path of an account removed outside the module. """
+        fm.create_account(self.account_name, self.password, self.pin)
+        fm.get_account_path(self.account_name)
+        shutil.rmtree(os.path.join(self.accounts_dir, self.account_name))
+        with self.assertRaises(ValueError):
+            fm.get_account_path(self.account_name)
+
+    def test_10_account_language(self):
+        """ Test a language longer than the read size. """
+        fm.create_account(self.account_name, self.password, self.pin)
+        language = "é" * 100
+        fm.set_account_language(self.account_name, language)
+        self.assertEqual(fm.get_account_language(self.account_name), language)
+        fm.delete_account(self.account_name)
+
+    @unittest.skipUnless(os.name == "posix", "File modes are POSIX specific.")
+    def test_11_set_profile_icon_mode(self):
+        """ Test that replacing the profile icon keeps its mode. """
+        fm.create_account(self.account_name, self.password, self.pin)
+        profile_icon_path = fm.get_profile_icon(self.account_name)
+        mode = os.stat(profile_icon_path).st_mode
+        fm.set_profile_icon(self.account_name, fm.get_UI_icon("default_profile"))
+        self.assertEqual(os.stat(profile_icon_path).st_mode, mode)
+        fm.delete_account(self.account_name)
+
 
 if __name__ == "__main__":
     unittest.main()